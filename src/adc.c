@@ -132,7 +132,7 @@ adc_t *ldx_adc_request_by_alias(char const * const adc_alias)
 	return new_adc;
 }
 
-int ldx_set_scale(adc_t *adc, float scale)
+int ldx_adc_set_scale(adc_t *adc, float scale)
 {
 	adc_internal_t *_adc = NULL;
 
@@ -145,6 +145,13 @@ int ldx_set_scale(adc_t *adc, float scale)
 	return EXIT_SUCCESS;
 }
 
+/*
+ * Previous releases exported this function as ldx_set_scale(), not under the
+ * name declared in adc.h. Keep the old symbol for binaries linked against it.
+ */
+int ldx_set_scale(adc_t *adc, float scale)
+	__attribute__ ((alias("ldx_adc_set_scale")));
+
 int ldx_adc_free(adc_t *adc)
 {
 	int ret = EXIT_SUCCESS;
@@ -236,7 +243,8 @@ float ldx_adc_convert_sample_to_mv(adc_t *adc, int sample)
 	return sample * _adc->scale;
 
 }
-void *ldx_sampling_callback_thread(void *callback_adc)
+
+static void *ldx_sampling_callback_thread(void *callback_adc)
 {
 	adc_t *adc = callback_adc;
 	adc_internal_t *_adc = NULL;
@@ -251,6 +259,8 @@ void *ldx_sampling_callback_thread(void *callback_adc)
 				_adc->callback->callback_arg);
 		sleep(_adc->callback->interval);
 	}
+
+	return NULL;
 }
 
 int ldx_adc_stop_sampling(adc_t *adc)
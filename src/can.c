@@ -59,7 +59,7 @@ static const unsigned char len2dlc[] = {0, 1, 2, 3, 4, 5, 6, 7, 8,		/* 0 - 8 */
 
 
 
-const char *const __can_error_str[CAN_ERROR_MAX + 1] = {
+static const char *const __can_error_str[CAN_ERROR_MAX + 1] = {
 	[CAN_ERROR_NONE]			= "Success",
 	[CAN_ERROR_NULL_INTERFACE]	= "CAN interface is NULL",
 	[CAN_ERROR_IFR_IDX]		= "Interface index error",
@@ -88,6 +88,10 @@ const char *const __can_error_str[CAN_ERROR_MAX + 1] = {
 	[CAN_ERROR_TX_SKT_BIND]		= "Socket bind error",
 	[CAN_ERROR_TX_RETRY_LATER]	= "TX retry later",
 	[CAN_ERROR_INCOMP_FRAME]		= "Incomplete TX frame",
+	[CAN_ERROR_NETWORK_DOWN]		= "Network is down",
+
+	[CAN_ERROR_RX_SKT_CREATE]		= "RX socket create error",
+	[CAN_ERROR_RX_SKT_BIND]		= "RX socket bind error",
 
 	[CAN_ERROR_SETSKTOPT_RAW_FLT]	= "setsocketopt CAN_RAW_FILTER error",
 	[CAN_ERROR_SETSKTOPT_ERR_FLT]	= "setsocketopt CAN_RAW_ERR_FILTER error",
@@ -98,7 +102,20 @@ const char *const __can_error_str[CAN_ERROR_MAX + 1] = {
 	[CAN_ERROR_SETSKTOPT_RCVBUF]	= "setsocketopt SO_RCVBUF error",
 	[CAN_ERROR_GETSKTOPT_RCVBUF]	= "getsocketopt SO_RCVBUF error",
 
+	[CAN_ERROR_SIOCGIFMTU]		= "ioctl SIOCGIFMTU error",
+	[CAN_ERROR_NOT_CANFD]		= "Interface is not CAN FD capable",
+	[CAN_ERROR_THREAD_CREATE]		= "Thread create error",
+	[CAN_ERROR_THREAD_ALLOC]		= "Thread allocation error",
+	[CAN_ERROR_THREAD_MUTEX_INIT]	= "Thread mutex init error",
+	[CAN_ERROR_THREAD_MUTEX_LOCK]	= "Thread mutex lock error",
+
+	[CAN_ERROR_REG_ERR_HDLR]		= "Register error handler error",
 	[CAN_ERROR_DROPPED_FRAMES]		= "Dropped frames",
+
+	[CAN_ERROR_RX_CB_NOT_FOUND]	= "RX callback not found",
+	[CAN_ERROR_RX_CB_ALR_REG]		= "RX callback already registered",
+	[CAN_ERROR_ERR_CB_NOT_FOUND]	= "Error callback not found",
+	[CAN_ERROR_ERR_CB_ALR_REG]	= "Error callback already registered",
 };
 
 static void ldx_can_default_error_handler(int error, void *data)
@@ -109,12 +126,10 @@ static void ldx_can_default_error_handler(int error, void *data)
 
 const char * ldx_can_strerror(int error)
 {
-	const char *err_string = NULL;
-
-	if (error > 0 && error < CAN_ERROR_MAX)
-		err_string = __can_error_str[error];
+	if (error < CAN_ERROR_NONE || error > CAN_ERROR_MAX)
+		return NULL;
 
-	return err_string;
+	return __can_error_str[error];
 }
 
 void ldx_can_set_defconfig(can_if_cfg_t *cfg)
@@ -127,6 +142,8 @@ void ldx_can_set_defconfig(can_if_cfg_t *cfg)
 	cfg->dbitrate		= LDX_CAN_INVALID_BITRATE;
 	cfg->restart_ms		= LDX_CAN_INVALID_RESTART_MS;
 	cfg->ctrl_mode.mask	= LDX_CAN_UNCONFIGURED_MASK;
+	memset(&cfg->bit_timing, 0, sizeof(cfg->bit_timing));
+	memset(&cfg->dbit_timing, 0, sizeof(cfg->dbit_timing));
 	cfg->error_mask		= CAN_ERR_TX_TIMEOUT |
 				  CAN_ERR_CRTL |
 				  CAN_ERR_BUSOFF |
@@ -297,6 +314,19 @@ static int ldx_can_process_rx_socket(can_if_t *cif, can_cb_t *rx_cb)
 	return ret;
 }
 
+/**
+ * ldx_can_thr_unlock() - Release the interface mutex held by the working thread
+ *
+ * @arg:	Pointer to the mutex to unlock.
+ *
+ * Installed as cancellation cleanup handler so a thread cancelled while
+ * blocked in select() does not leave the mutex locked.
+ */
+static void ldx_can_thr_unlock(void *arg)
+{
+	pthread_mutex_unlock((pthread_mutex_t *)arg);
+}
+
 static void *ldx_can_thr(void *arg)
 {
 	can_if_t *cif = (can_if_t *)arg;
@@ -308,6 +338,7 @@ static void *ldx_can_thr(void *arg)
 		struct timeval tout;
 
 		pthread_mutex_lock(&pdata->mutex);
+		pthread_cleanup_push(ldx_can_thr_unlock, &pdata->mutex);
 
 		memcpy(&fds, &pdata->can_fds, sizeof(fds));
 		memcpy(&tout, &pdata->can_tout, sizeof(tout));
@@ -343,7 +374,7 @@ static void *ldx_can_thr(void *arg)
 			}
 		}
 
-		pthread_mutex_unlock(&pdata->mutex);
+		pthread_cleanup_pop(1);
 
 		sched_yield();
 	}
@@ -376,7 +407,7 @@ int ldx_can_init(can_if_t *cif, can_if_cfg_t *cfg)
 		if (ret)
 			return ret;
 
-		cif->cfg.bitrate = cfg->bitrate;
+		cif->cfg.dbitrate = cfg->dbitrate;
 	}
 
 	/* Set restart ms if required */
@@ -390,11 +421,20 @@ int ldx_can_init(can_if_t *cif, can_if_cfg_t *cfg)
 
 	/* Configure the bit_timing setting */
 	if (cfg->bit_timing.bitrate) {
-		ret = ldx_can_set_restart_ms(cif, cfg->restart_ms);
+		ret = ldx_can_set_bit_timing(cif, &cfg->bit_timing);
 		if (ret)
 			return ret;
 
-		cif->cfg.restart_ms = cfg->restart_ms;
+		cif->cfg.bit_timing = cfg->bit_timing;
+	}
+
+	/* Configure the data bit_timing setting */
+	if (cfg->dbit_timing.bitrate) {
+		ret = ldx_can_set_data_bit_timing(cif, &cfg->dbit_timing);
+		if (ret)
+			return ret;
+
+		cif->cfg.dbit_timing = cfg->dbit_timing;
 	}
 
 	/* Configure the control mode setting */
@@ -556,20 +596,10 @@ int ldx_can_init(can_if_t *cif, can_if_cfg_t *cfg)
 		pthread_attr_init(&pdata->can_thr_attr);
 		pthread_attr_setschedpolicy(&pdata->can_thr_attr, SCHED_FIFO);
 
-		ret = pthread_mutex_init(&pdata->mutex, NULL);
-		if (ret) {
-			log_error("%s: Unable init thread mutex %s",
-				  __func__, cif->name);
-			ret = -CAN_ERROR_THREAD_MUTEX_INIT;
-			goto err_thr_alloc;
-		}
-
 		ret = pthread_create(pdata->can_thr, NULL, ldx_can_thr, cif);
 		if (ret) {
 			log_error("%s: Unable to create thread in %s",
 				  __func__, cif->name);
-			pthread_mutex_unlock(&pdata->mutex);
-			pthread_mutex_destroy(&pdata->mutex);
 			ret = -CAN_ERROR_THREAD_CREATE;
 			goto err_thr_alloc;
 		}
@@ -579,9 +609,11 @@ int ldx_can_init(can_if_t *cif, can_if_cfg_t *cfg)
 
 err_thr_alloc:
 	free(pdata->can_thr);
+	pdata->can_thr = NULL;
 
 err_skt_close:
 	close(pdata->tx_skt);
+	pdata->tx_skt = -1;
 
 	return ret;
 }
@@ -607,6 +639,18 @@ can_if_t *ldx_can_request_by_name(const char * const if_name)
 		return NULL;
 	}
 
+	/*
+	 * The mutex protects the callback lists, which can be used before
+	 * the interface is initialized, so it lives as long as the handle
+	 */
+	if (pthread_mutex_init(&priv->mutex, NULL)) {
+		log_error("%s: Unable init thread mutex %s",
+			  __func__, if_name);
+		free(priv);
+		free(cif);
+		return NULL;
+	}
+
 	strncpy(cif->name, if_name, IFNAMSIZ - 1);
 	cif->name[IFNAMSIZ - 1] = '\0';
 	INIT_LIST_HEAD(&priv->err_cb_list_head);
@@ -614,6 +658,7 @@ can_if_t *ldx_can_request_by_name(const char * const if_name)
 	priv->can_tout.tv_sec = LDX_CAN_DEF_TOUT_SEC;
 	priv->can_tout.tv_usec = LDX_CAN_DEF_TOUT_USEC;
 	priv->run_thr = true;
+	priv->tx_skt = -1;
 	cif->_data = priv;
 
 	return cif;
@@ -642,20 +687,44 @@ int ldx_can_free(can_if_t *cif)
 {
 	int ret = EXIT_SUCCESS;
 	can_priv_t *pdata;
+	can_cb_t *rxcb, *rxcb_tmp;
+	can_err_cb_t *errcb, *errcb_tmp;
 
 	if (!cif)
 		return EXIT_SUCCESS;
 
 	pdata = cif->_data;
-	pthread_mutex_lock(&pdata->mutex);
-	pthread_mutex_destroy(&pdata->mutex);
-	pthread_cancel(*pdata->can_thr);
 
-	ret = ldx_can_stop(cif);
-	if (ret)
-		log_error("%s: can not stop iface %s", __func__, cif->name);
+	/* The thread only exists if the interface was initialized */
+	if (pdata->can_thr) {
+		pdata->run_thr = false;
+		pthread_cancel(*pdata->can_thr);
+		pthread_join(*pdata->can_thr, NULL);
+		free(pdata->can_thr);
+	}
 
-	close(pdata->tx_skt);
+	/* The socket is only open if the interface was initialized */
+	if (pdata->tx_skt >= 0) {
+		ret = ldx_can_stop(cif);
+		if (ret)
+			log_error("%s: can not stop iface %s",
+				  __func__, cif->name);
+	}
+
+	list_for_each_entry_safe(rxcb, rxcb_tmp, &pdata->rx_cb_list_head, list) {
+		close(rxcb->rx_skt);
+		list_del(&rxcb->list);
+		free(rxcb);
+	}
+
+	list_for_each_entry_safe(errcb, errcb_tmp, &pdata->err_cb_list_head, list) {
+		list_del(&errcb->list);
+		free(errcb);
+	}
+
+	if (pdata->tx_skt >= 0)
+		close(pdata->tx_skt);
+	pthread_mutex_destroy(&pdata->mutex);
 	free(pdata);
 	free(cif);
 
@@ -16,6 +16,7 @@
 
 #define _GNU_SOURCE
 
+#include <pthread.h>
 #include <stdarg.h>
 #include <stdlib.h>
 #include <stdio.h>
@@ -25,6 +26,7 @@
 #include "_log.h"
 #include "_common.h"
 #include "common.h"
+#include "gpio.h"
 
 #define DEFAULT_DIGIAPIX_CFG_FILE	"/etc/libdigiapix.conf"
 #define ARRAY_SIZE(x) (sizeof(x) / sizeof((x)[0]))
@@ -40,22 +42,30 @@ static void __attribute__ ((constructor(101))) digiapix_init(void);
 static void __attribute__ ((destructor(101))) digiapix_fini(void);
 
 static int config_load(void);
+static void config_load_once(void);
 static void config_free(void);
 static int config_get_csv_integer(const char * const group, const char * const alias,
 				  int index);
 static int config_get_csv_string(const char * const group, const char * const alias,
-				 char * const controller, int index);
+				 char * const controller, size_t size, int index);
+static const char *csv_field(const char *value, int index, size_t *len);
 
 static board_config *config;
+static pthread_once_t config_once = PTHREAD_ONCE_INIT;
+static digi_platform_t digi_platform = INVALID_PLATFORM;
+static pthread_once_t digi_platform_once = PTHREAD_ONCE_INIT;
 
 int config_check_alias(const char * const alias)
 {
-	if (alias == NULL || strlen(alias) == 0) {
+	if (alias == NULL || alias[0] == '\0') {
 		log_error("%s: Invalid alias, it cannot be %s", __func__,
 				alias == NULL ? "NULL" : "empty");
 		return EXIT_FAILURE;
 	}
 
+	/* The board configuration is only parsed once an alias is used */
+	pthread_once(&config_once, config_load_once);
+
 	if (config == NULL) {
 		log_error("%s: Unable get requested alias ('%s')",
 				__func__, alias);
@@ -72,7 +82,8 @@ int config_get_gpio_kernel_number(const char * const alias)
 
 int config_get_gpio_controller(const char * const alias, char * const controller)
 {
-	return config_get_csv_string("GPIO", alias, controller, 0);
+	return config_get_csv_string("GPIO", alias, controller,
+				     MAX_CONTROLLER_LEN, 0);
 }
 
 int config_get_gpio_line(const char * const alias)
@@ -80,6 +91,28 @@ int config_get_gpio_line(const char * const alias)
 	return config_get_csv_integer("GPIO", alias, 1);
 }
 
+int config_get_gpio_controller_line(const char * const alias, char * const controller)
+{
+	const char *controller_field, *line_field;
+	size_t controller_len, line_len;
+	const char *value = conffile_get(config->conf, "GPIO", alias, NULL);
+
+	if (value == NULL || controller == NULL)
+		return -1;
+
+	/* Both fields come from the same '<controller>,<line>' value */
+	controller_field = csv_field(value, 0, &controller_len);
+	line_field = csv_field(value, 1, &line_len);
+	if (controller_field == NULL || line_field == NULL ||
+	    controller_len >= MAX_CONTROLLER_LEN)
+		return -1;
+
+	memcpy(controller, controller_field, controller_len);
+	controller[controller_len] = '\0';
+
+	return atoi(line_field);
+}
+
 int config_get_pwm_chip_number(const char * const alias)
 {
 	return config_get_csv_integer("PWM", alias, 0);
@@ -135,8 +168,6 @@ int check_request_mode(request_mode_t request_mode)
 static void digiapix_init(void)
 {
 	init_logger(LOG_ERR, LOG_CONS | LOG_NDELAY | LOG_PID | LOG_PERROR);
-
-	config_load();
 }
 
 /**
@@ -171,6 +202,17 @@ static int config_load(void)
 	return config == NULL ? EXIT_FAILURE : EXIT_SUCCESS;
 }
 
+/**
+ * config_load_once() - Load the board configuration on first use
+ *
+ * Called through 'pthread_once()' by 'config_check_alias()', so programs
+ * that never use an alias do not pay for parsing the configuration file.
+ */
+static void config_load_once(void)
+{
+	config_load();
+}
+
 /**
  * config_free() - Free up memory for the configuration
  */
@@ -182,6 +224,34 @@ static void config_free(void)
 	}
 }
 
+/**
+ * csv_field() - Locate a field of a comma-separated value
+ *
+ * @value:	The comma-separated value.
+ * @index:	The index of the field to locate.
+ * @len:	Where the length of the field is stored on success.
+ *
+ * The value is walked in place, without copying or modifying it. Like
+ * strtok(), empty fields are skipped: leading and consecutive commas act
+ * as a single separator.
+ *
+ * Return: A pointer to the first character of the field, NULL if the value
+ *	   has no field at the given index.
+ */
+static const char *csv_field(const char *value, int index, size_t *len)
+{
+	const char *field = value + strspn(value, ",");
+
+	while (*field != '\0' && index-- > 0) {
+		field += strcspn(field, ",");
+		field += strspn(field, ",");
+	}
+
+	*len = strcspn(field, ",");
+
+	return *len > 0 ? field : NULL;
+}
+
 /**
  * config_get_csv_integer() - Return the comma-separated integer for the given
  *                            index in the requested configuration value
@@ -194,32 +264,19 @@ static void config_free(void)
  */
 static int config_get_csv_integer(const char * const group, const char * const alias, int index)
 {
-	char *array = NULL;
-	char *token = NULL;
-	int item_index = 0;
-	int item = -1;
+	const char *field = NULL;
+	size_t len;
 	const char *value = conffile_get(config->conf, group, alias, NULL);
 
 	if (value == NULL)
 		return -1;
 
-	array = strdup(value);
-	if (array == NULL)
+	field = csv_field(value, index, &len);
+	if (field == NULL)
 		return -1;
-	token = strtok(array, ",");
 
-	/* Walk through other tokens */
-	while (token && (item_index < index)) {
-		token = strtok(NULL, ",");
-		item_index++;
-	}
-
-	if (token != NULL)
-		item = (unsigned int)atoi(token);
-
-	free(array);
-
-	return item;
+	/* atoi() stops at the ',' that ends the field */
+	return atoi(field);
 }
 
 /**
@@ -229,37 +286,30 @@ static int config_get_csv_integer(const char * const group, const char * const a
  * @group: The configuration group.
  * @alias: The alias of the comma-separated configuration value.
  * @item: Array where the item is stored on success.
+ * @size: The size of the item array.
  * @index: The index of the comma-separated value to get
  *
- * Return: 0 on success, -1 on error.
+ * Return: 0 on success, -1 on error or if the item does not fit in the array.
  */
 static int config_get_csv_string(const char * const group, const char * const alias,
-				 char * const item, int index)
+				 char * const item, size_t size, int index)
 {
-	char *array = NULL;
-	char *token = NULL;
-	int item_index = 0;
+	const char *field = NULL;
+	size_t len;
 	const char *value = conffile_get(config->conf, group, alias, NULL);
 
 	if (value == NULL || item == NULL)
 		return -1;
 
-	array = strdup(value);
-	if (array == NULL)
-		return -1;
-	token = strtok(array, ",");
+	field = csv_field(value, index, &len);
+	if (field != NULL) {
+		if (len >= size)
+			return -1;
 
-	/* Walk through other tokens */
-	while (token && (item_index < index)) {
-		token = strtok(NULL, ",");
-		item_index++;
+		memcpy(item, field, len);
+		item[len] = '\0';
 	}
 
-	if (token != NULL)
-		strcpy(item, token);
-
-	free(array);
-
 	return 0;
 }
 
@@ -371,20 +421,20 @@ char *concat_path(const char *dir, const char *file)
 }
 
 /**
- * get_digi_platform() - Return the Digi platform
+ * detect_digi_platform() - Detect the Digi platform
  *
- * Return: a digi_platform_t
+ * Called through 'pthread_once()' by 'get_digi_platform()'. The platform
+ * cannot change at runtime, so it is only read once.
  */
-digi_platform_t get_digi_platform()
+static void detect_digi_platform(void)
 {
 	char *cmd_output = NULL;
 	char *cmd;
-	digi_platform_t platform = INVALID_PLATFORM;
 
 	asprintf(&cmd, READ_PATH, PLATFORM_PATH);
 	if (!cmd) {
 		log_error("%s: Unable to allocate memory for the command", __func__);
-		return INVALID_PLATFORM;
+		return;
 	}
 
 	cmd_output = get_cmd_output(cmd);
@@ -392,21 +442,31 @@ digi_platform_t get_digi_platform()
 		log_error("%s: Unable to get the current platform",
 			  __func__);
 		free(cmd);
-		return INVALID_PLATFORM;
+		return;
 	}
 
 	if (strstr(cmd_output , CC6UL_PLATFORM_STRING) != NULL)
-		platform = CC6UL_PLATFORM;
+		digi_platform = CC6UL_PLATFORM;
 	else if (strstr(cmd_output, CC8MN_PLATFORM_STRING) != NULL)
-		platform = CC8MN_PLATFORM;
+		digi_platform = CC8MN_PLATFORM;
 	else if (strstr(cmd_output, CC8X_PLATFORM_STRING) != NULL)
-		platform = CC8X_PLATFORM;
+		digi_platform = CC8X_PLATFORM;
 	else if (strstr(cmd_output, CC6_PLATFORM_STRING) != NULL ||
 			strstr(cmd_output, CC6DL_PLATFORM_STRING))
-		platform = CC6_PLATFORM;
+		digi_platform = CC6_PLATFORM;
 
 	free(cmd);
 	free(cmd_output);
+}
+
+/**
+ * get_digi_platform() - Return the Digi platform
+ *
+ * Return: a digi_platform_t
+ */
+digi_platform_t get_digi_platform()
+{
+	pthread_once(&digi_platform_once, detect_digi_platform);
 
-	return platform;
+	return digi_platform;
 }
@@ -21,6 +21,7 @@
 #include <unistd.h>
 #include <errno.h>
 #include <gpiod.h>
+#include <poll.h>
 #include <sys/ioctl.h>
 #include <linux/gpio.h>
 
@@ -29,18 +30,20 @@
 #include "_log.h"
 #include "gpio.h"
 
-struct wait_irq_t {
-	pthread_t *poll_thread;
-	struct poll_ctx_t *poll_ctx;
-};
-
 struct poll_ctx_t {
 	int fd;
-	int sigfd;
 	int (*callback_fn) (void *);
 	void *arg;
 };
 
+struct wait_irq_t {
+	pthread_t poll_thread;
+	struct poll_ctx_t poll_ctx;
+};
+
+/* '<controller> <line>' plus room for the line number and the separator */
+#define GPIO_LABEL_LEN	(MAX_CONTROLLER_LEN + 5)
+
 struct _gpio_t {
 	int _mode;
 	gpio_active_mode_t _active_mode;
@@ -48,6 +51,7 @@ struct _gpio_t {
 	struct gpiod_chip *_chip;
 	struct gpiod_line *_line;
 	struct wait_irq_t *_wait_irq;
+	char _label[GPIO_LABEL_LEN];
 };
 
 #define UNDEFINED_SYSFS_GPIO (-1)
@@ -94,10 +98,38 @@ static const char * const gpio_edge_strings[] = {
 	"both"
 };
 
+/* libgpiod request type and initial value of each GPIO mode */
+static const struct {
+	int request_type;
+	int default_val;
+} gpiod_mode_cfg[] = {
+	[GPIO_INPUT] = { GPIOD_LINE_REQUEST_DIRECTION_INPUT, 0 },
+	[GPIO_OUTPUT_LOW] = { GPIOD_LINE_REQUEST_DIRECTION_OUTPUT, 0 },
+	[GPIO_OUTPUT_HIGH] = { GPIOD_LINE_REQUEST_DIRECTION_OUTPUT, 1 },
+	[GPIO_IRQ_EDGE_RISING] = { GPIOD_LINE_REQUEST_EVENT_RISING_EDGE, 0 },
+	[GPIO_IRQ_EDGE_FALLING] = { GPIOD_LINE_REQUEST_EVENT_FALLING_EDGE, 0 },
+	[GPIO_IRQ_EDGE_BOTH] = { GPIOD_LINE_REQUEST_EVENT_BOTH_EDGES, 0 },
+};
+
+/* sysfs direction and edge of each GPIO mode */
+static const struct {
+	_gpio_dir_modes_t dir;
+	libsoc_gpio_edge_t edge;
+} sysfs_mode_cfg[] = {
+	[GPIO_INPUT] = { in, NONE },
+	[GPIO_OUTPUT_LOW] = { low, EDGE_ERROR },
+	[GPIO_OUTPUT_HIGH] = { high, EDGE_ERROR },
+	[GPIO_IRQ_EDGE_RISING] = { in, RISING },
+	[GPIO_IRQ_EDGE_FALLING] = { in, FALLING },
+	[GPIO_IRQ_EDGE_BOTH] = { in, BOTH },
+};
+
 static int check_gpio(gpio_t *gpio);
 static char * show_gpio(gpio_t *gpio);
+static void set_label(gpio_t *gpio);
 static int set_direction(libsoc_gpio_t *gpio, _gpio_dir_modes_t dir);
 static int check_mode(gpio_mode_t mode);
+static int set_mode(gpio_t *gpio, gpio_mode_t mode);
 
 gpio_t *ldx_gpio_request(unsigned int kernel_number, gpio_mode_t mode,
 			 request_mode_t request_mode)
@@ -152,8 +184,9 @@ gpio_t *ldx_gpio_request(unsigned int kernel_number, gpio_mode_t mode,
 
 	memcpy(new_gpio, &init_gpio, sizeof(gpio_t));
 	new_gpio->_data = data;
+	set_label(new_gpio);
 
-	if (ldx_gpio_set_mode(new_gpio, mode) != EXIT_SUCCESS) {
+	if (set_mode(new_gpio, mode) != EXIT_SUCCESS) {
 		ldx_gpio_free(new_gpio);
 		return NULL;
 	}
@@ -165,7 +198,7 @@ gpio_t *ldx_gpio_request_by_alias(const char * const gpio_alias, gpio_mode_t mod
 				  request_mode_t request_mode)
 {
 	char *controller_label = NULL;
-	int line, kernel_number, controller_ret;
+	int line, kernel_number;
 	gpio_t *new_gpio = NULL;
 
 	if (check_mode(mode) != EXIT_SUCCESS)
@@ -180,15 +213,17 @@ gpio_t *ldx_gpio_request_by_alias(const char * const gpio_alias, gpio_mode_t mod
 	log_debug("%s: Requesting GPIO '%s' [mode '%s' (%d), request mode: %d]",
 		  __func__, gpio_alias, gpio_mode_strings[mode], mode, request_mode);
 
+	if (config_check_alias(gpio_alias) != EXIT_SUCCESS)
+		return NULL;
+
 	/* Attempt parsing the configuration file as '<alias> = <controller>,<line>' */
 	controller_label = calloc(1, MAX_CONTROLLER_LEN);
 	if (controller_label == NULL) {
 		log_error("%s: Unable to request GPIO. Cannot allocate memory", __func__);
 		return NULL;
 	}
-	controller_ret = ldx_gpio_get_controller(gpio_alias, controller_label);
-	line = ldx_gpio_get_line(gpio_alias);
-	if ((controller_ret == -1) || (line == -1))  {
+	line = config_get_gpio_controller_line(gpio_alias, controller_label);
+	if (line == -1) {
 		free (controller_label);
 		goto attempt_sysfs;
 	}
@@ -279,8 +314,9 @@ gpio_t *ldx_gpio_request_by_controller(const char * const controller,
 
 	memcpy(new_gpio, &init_gpio, sizeof(gpio_t));
 	new_gpio->_data = data;
+	set_label(new_gpio);
 
-	if (ldx_gpio_set_mode(new_gpio, mode) != EXIT_SUCCESS) {
+	if (set_mode(new_gpio, mode) != EXIT_SUCCESS) {
 		ldx_gpio_free(new_gpio);
 		return NULL;
 	}
@@ -403,135 +439,13 @@ int ldx_gpio_set_debounce(gpio_t *gpio, unsigned int usec)
 
 int ldx_gpio_set_mode(gpio_t *gpio, gpio_mode_t mode)
 {
-	int ret = EXIT_FAILURE;
-	struct _gpio_t *_data = NULL;
-
 	if (check_gpio(gpio) != EXIT_SUCCESS)
 		return EXIT_FAILURE;
 
 	if (check_mode(mode) != EXIT_SUCCESS)
 		return EXIT_FAILURE;
 
-	log_debug("%s: Setting mode for GPIO %s, mode: '%s' (%d)", __func__,
-		  show_gpio(gpio), gpio_mode_strings[mode], mode);
-
-	_data = gpio->_data;
-
-	if (gpio->kernel_number == UNDEFINED_SYSFS_GPIO) {
-		struct gpiod_line_request_config request_cfg = { 0 };
-		int default_val = 0;
-
-		request_cfg.consumer = show_gpio(gpio);
-		request_cfg.request_type = GPIOD_LINE_REQUEST_DIRECTION_AS_IS;
-
-		if (_data->_active_mode == GPIO_ACTIVE_LOW)
-			request_cfg.flags |= GPIOD_LINE_REQUEST_FLAG_ACTIVE_LOW;
-
-		switch (mode) {
-		case GPIO_INPUT:
-			request_cfg.request_type = GPIOD_LINE_REQUEST_DIRECTION_INPUT;
-			break;
-		case GPIO_OUTPUT_LOW:
-			request_cfg.request_type = GPIOD_LINE_REQUEST_DIRECTION_OUTPUT;
-			default_val = 0;
-			break;
-		case GPIO_OUTPUT_HIGH:
-			request_cfg.request_type = GPIOD_LINE_REQUEST_DIRECTION_OUTPUT;
-			default_val = 1;
-			break;
-		case GPIO_IRQ_EDGE_RISING:
-			request_cfg.request_type = GPIOD_LINE_REQUEST_EVENT_RISING_EDGE;
-			break;
-		case GPIO_IRQ_EDGE_FALLING:
-			request_cfg.request_type = GPIOD_LINE_REQUEST_EVENT_FALLING_EDGE;
-			break;
-		case GPIO_IRQ_EDGE_BOTH:
-			request_cfg.request_type = GPIOD_LINE_REQUEST_EVENT_BOTH_EDGES;
-			break;
-		default:
-			/* Should not occur */
-			return EXIT_FAILURE;
-		}
-
-		if (gpiod_line_is_used(_data->_line)) {
-			/* Check if line was requested by us */
-			if (gpiod_line_is_requested(_data->_line)) {
-				log_debug("%s: GPIO %s was requested by us",
-					  __func__, show_gpio(gpio));
-
-				/* Release it so we can request it again */
-				gpiod_line_release(_data->_line);
-			} else {
-				log_error("%s: GPIO %s was in use by '%s'",
-					  __func__, show_gpio(gpio),
-					  gpiod_line_consumer(_data->_line));
-				return EXIT_FAILURE;
-			}
-		}
-
-		ret = gpiod_line_request(_data->_line, &request_cfg, default_val);
-		if (ret != EXIT_SUCCESS) {
-			log_error("%s: Unable to set GPIO %s to mode: '%s' (%d)",
-				  __func__, show_gpio(gpio), gpio_mode_strings[mode],
-				  mode);
-			return ret;
-		}
-	} else {
-		_gpio_dir_modes_t dir = in;
-		libsoc_gpio_edge_t edge = EDGE_ERROR;
-
-		switch (mode) {
-		case GPIO_INPUT:
-			dir = in;
-			edge = NONE;
-			break;
-		case GPIO_OUTPUT_LOW:
-			dir = low;
-			edge = EDGE_ERROR;
-			break;
-		case GPIO_OUTPUT_HIGH:
-			dir = high;
-			edge = EDGE_ERROR;
-			break;
-		case GPIO_IRQ_EDGE_RISING:
-			dir = in;
-			edge = RISING;
-			break;
-		case GPIO_IRQ_EDGE_FALLING:
-			dir = in;
-			edge = FALLING;
-			break;
-		case GPIO_IRQ_EDGE_BOTH:
-			dir = in;
-			edge = BOTH;
-			break;
-		default:
-			/* Should not occur */
-			return EXIT_FAILURE;
-		}
-
-		ret = set_direction(_data->_internal_gpio, dir);
-		if (ret != EXIT_SUCCESS) {
-			log_error("%s: Unable to set GPIO %d direction to '%s' (%d)",
-				  __func__, gpio->kernel_number,
-				  gpio_dir_strings[dir], dir);
-			return ret;
-		}
-
-		if ((edge != EDGE_ERROR) && (edge != NONE)) {
-			ret = libsoc_gpio_set_edge(_data->_internal_gpio, edge);
-			if (ret != EXIT_SUCCESS) {
-				log_error("%s: Unable to set GPIO %d edge to '%s' (%d)",
-					  __func__, gpio->kernel_number,
-					  gpio_edge_strings[edge], edge);
-			}
-		}
-	}
-
-	if (ret == EXIT_SUCCESS)
-		_data->_mode = mode;
-
-	return ret;
+	return set_mode(gpio, mode);
 }
 
 gpio_mode_t ldx_gpio_get_mode(gpio_t *gpio)
@@ -638,6 +552,61 @@ int ldx_gpio_set_value(gpio_t *gpio, gpio_value_t value)
 	return ret;
 }
 
+int ldx_gpio_set_value_sequence(gpio_t *gpio, const gpio_value_t *values,
+				unsigned int count, unsigned int delay_us)
+{
+	struct _gpio_t *_data = NULL;
+	unsigned int i;
+	int ret = EXIT_SUCCESS;
+
+	if (check_gpio(gpio) != EXIT_SUCCESS)
+		return EXIT_FAILURE;
+
+	if (values == NULL && count > 0) {
+		log_error("%s: Values cannot be NULL", __func__);
+		return EXIT_FAILURE;
+	}
+
+	/* Validate the whole sequence before writing anything */
+	for (i = 0; i < count; i++) {
+		switch (values[i]) {
+		case GPIO_LOW:
+		case GPIO_HIGH:
+			break;
+		default:
+			log_error("%s: Invalid GPIO value at position %u, %d. "
+				  "Value must be '%s' or '%s'",
+				  __func__, i, values[i],
+				  gpio_value_strings[GPIO_LOW],
+				  gpio_value_strings[GPIO_HIGH]);
+			return EXIT_FAILURE;
+		}
+	}
+
+	log_debug("%s: Setting %u values for GPIO %s, delay: %u us", __func__,
+		  count, show_gpio(gpio), delay_us);
+
+	_data = gpio->_data;
+
+	for (i = 0; i < count; i++) {
+		if (i > 0 && delay_us > 0)
+			usleep(delay_us);
+
+		if (gpio->kernel_number == UNDEFINED_SYSFS_GPIO)
+			ret = gpiod_line_set_value(_data->_line, values[i]);
+		else
+			ret = libsoc_gpio_set_level(_data->_internal_gpio, values[i]);
+
+		if (ret != EXIT_SUCCESS) {
+			log_error("%s: Unable to set GPIO %s value to %d at position %u",
+				  __func__, show_gpio(gpio), values[i], i);
+			return EXIT_FAILURE;
+		}
+	}
+
+	return EXIT_SUCCESS;
+}
+
 gpio_value_t ldx_gpio_get_value(gpio_t *gpio)
 {
 	struct _gpio_t *_data = NULL;
@@ -666,11 +635,13 @@ gpio_value_t ldx_gpio_get_value(gpio_t *gpio)
 
 int ldx_gpio_set_active_mode(gpio_t *gpio, gpio_active_mode_t active_mode)
 {
-	struct _gpio_t *_data = gpio->_data;
+	struct _gpio_t *_data = NULL;
 
 	if (check_gpio(gpio) != EXIT_SUCCESS)
 		return EXIT_FAILURE;
 
+	_data = gpio->_data;
+
 	switch (active_mode) {
 	case GPIO_ACTIVE_HIGH:
 	case GPIO_ACTIVE_LOW:
@@ -699,7 +670,7 @@ int ldx_gpio_set_active_mode(gpio_t *gpio, gpio_active_mode_t active_mode)
 			active_mode == GPIO_ACTIVE_LOW))
 			return EXIT_SUCCESS;
 
-		if (ldx_gpio_set_mode(gpio, _data->_mode) != EXIT_SUCCESS)
+		if (set_mode(gpio, _data->_mode) != EXIT_SUCCESS)
 			return EXIT_FAILURE;
 	} else {
 		int fd;
@@ -715,7 +686,8 @@ int ldx_gpio_set_active_mode(gpio_t *gpio, gpio_active_mode_t active_mode)
 			return EXIT_FAILURE;
 		}
 
-		if (write(fd, gpio_active_mode_strings[active_mode], BUFF_SIZE) < 0) {
+		if (write(fd, gpio_active_mode_strings[active_mode],
+			  strlen(gpio_active_mode_strings[active_mode])) < 0) {
 			log_error("%s: Unable to change GPIO %d active mode",
 					  __func__, gpio->kernel_number);
 			close(fd);
@@ -849,7 +821,7 @@ gpio_irq_error_t ldx_gpio_wait_interrupt(gpio_t *gpio, int timeout)
 	}
 }
 
-void *libgpio_poll_thread(void *data)
+static void *libgpio_poll_thread(void *data)
 {
 	struct pollfd pfds;
 	struct poll_ctx_t *ctx = data;
@@ -861,22 +833,39 @@ void *libgpio_poll_thread(void *data)
 	while (1) {
 		cnt = poll(&pfds, 1, ts);
 		if (cnt < 0) {
-			/* Error */
-			log_error("%s: error polling GPIO", __func__);
-			continue;
+			if (errno == EINTR)
+				continue;
+
+			/* Any other error is permanent, do not spin on it */
+			log_error("%s: error polling GPIO (%d)", __func__, errno);
+			break;
 		} else if (cnt == 0) {
 			/* Timeout */
 			continue;
 		}
 
-		if (pfds.revents) {
+		/*
+		 * A closed or invalid descriptor is reported in revents, not
+		 * as a poll() failure, and it stays set on every call
+		 */
+		if (pfds.revents & (POLLNVAL | POLLERR | POLLHUP)) {
+			log_error("%s: error on GPIO event descriptor (revents 0x%x)",
+				  __func__, pfds.revents);
+			break;
+		}
+
+		if (pfds.revents & (POLLIN | POLLPRI)) {
 			struct gpiod_line_event event;
 
-			gpiod_line_event_read_fd(ctx->fd, &event);
+			/* Only dispatch the callback for events actually read */
+			if (gpiod_line_event_read_fd(ctx->fd, &event) != 0)
+				continue;
 
 			ctx->callback_fn(ctx->arg);
 		}
 	}
+
+	return NULL;
 }
 
 int ldx_gpio_start_wait_interrupt(gpio_t *gpio, const ldx_gpio_interrupt_cb_t interrupt_cb,
@@ -891,9 +880,7 @@ int ldx_gpio_start_wait_interrupt(gpio_t *gpio, const ldx_gpio_interrupt_cb_t in
 
 	if (gpio->kernel_number == UNDEFINED_SYSFS_GPIO) {
 		struct wait_irq_t *wait_irq = NULL;
-		pthread_t *poll_thread = NULL;
 		pthread_attr_t pthread_attr;
-		struct poll_ctx_t *poll_ctx = NULL;
 		int fd, rv;
 
 		switch (_data->_mode) {
@@ -929,46 +916,26 @@ int ldx_gpio_start_wait_interrupt(gpio_t *gpio, const ldx_gpio_interrupt_cb_t in
 			return EXIT_FAILURE;
 		}
 
-		wait_irq = malloc (sizeof (struct wait_irq_t));
+		/* The thread handle and its poll context share one allocation */
+		wait_irq = malloc(sizeof(struct wait_irq_t));
 		if (wait_irq == NULL) {
 			log_error("%s: Error allocating mem for wait_irq on GPIO %s",
 				  __func__, show_gpio(gpio));
 			return EXIT_FAILURE;
 		}
 
-		poll_thread = malloc (sizeof (pthread_t));
-		if (poll_thread == NULL) {
-			log_error("%s: Error allocating mem for thread on GPIO %s",
-				  __func__, show_gpio(gpio));
-			free(wait_irq);
-			return EXIT_FAILURE;
-		}
-
-		poll_ctx = malloc(sizeof(struct poll_ctx_t));
-		if (poll_ctx == NULL) {
-			log_error("%s: Error allocating mem for poll_ctx on GPIO %s",
-				  __func__, show_gpio(gpio));
-			free(poll_thread);
-			free(wait_irq);
-			return EXIT_FAILURE;
-		}
-
 		pthread_attr_init(&pthread_attr);
 		pthread_attr_setschedpolicy(&pthread_attr, SCHED_FIFO);
 
-		poll_ctx->fd = fd;
-		poll_ctx->callback_fn = interrupt_cb;
-		poll_ctx->arg = arg;
+		wait_irq->poll_ctx.fd = fd;
+		wait_irq->poll_ctx.callback_fn = interrupt_cb;
+		wait_irq->poll_ctx.arg = arg;
 
-		wait_irq->poll_ctx = poll_ctx;
-		wait_irq->poll_thread = poll_thread;
 		_data->_wait_irq = wait_irq;
 
-		rv = pthread_create(poll_thread, NULL, libgpio_poll_thread,
-				    poll_ctx);
+		rv = pthread_create(&wait_irq->poll_thread, NULL,
+				    libgpio_poll_thread, &wait_irq->poll_ctx);
 		if (rv) {
-			free(poll_thread);
-			free(poll_ctx);
 			free(wait_irq);
 			_data->_wait_irq = NULL;
 
@@ -1020,14 +987,13 @@ int ldx_gpio_stop_wait_interrupt(gpio_t *gpio)
 	_data = gpio->_data;
 
 	if (gpio->kernel_number == UNDEFINED_SYSFS_GPIO) {
-		if (_data->_wait_irq && _data->_wait_irq->poll_thread != NULL) {
-			pthread_cancel(*_data->_wait_irq->poll_thread);
-			pthread_join(*_data->_wait_irq->poll_thread, NULL);
+		if (_data->_wait_irq != NULL) {
+			pthread_cancel(_data->_wait_irq->poll_thread);
+			pthread_join(_data->_wait_irq->poll_thread, NULL);
 
-			free(_data->_wait_irq->poll_ctx);
-			free(_data->_wait_irq->poll_thread);
 			free(_data->_wait_irq);
 			_data->_wait_irq = NULL;
+			ret = EXIT_SUCCESS;
 
 			log_debug("%s: Stop waiting for interrupts on GPIO %s",
 				  __func__, show_gpio(gpio));
@@ -1079,18 +1045,55 @@ static int check_gpio(gpio_t *gpio)
 	return EXIT_SUCCESS;
 }
 
+/**
+ * show_gpio() - Get the printable label of a GPIO
+ *
+ * @gpio:	The GPIO to get its label.
+ *
+ * Requested GPIOs return the label cached by set_label(), so no formatting is
+ * done on every log message. Only GPIOs without internal data are formatted
+ * on the fly.
+ *
+ * Return: The GPIO label.
+ */
 static char * show_gpio(gpio_t *gpio)
 {
-	static char _show_gpio[MAX_CONTROLLER_LEN] = "";
+	static char _show_gpio[GPIO_LABEL_LEN] = "";
+	struct _gpio_t *_data = gpio->_data;
+
+	if (_data != NULL)
+		return _data->_label;
 
 	if (gpio->kernel_number == UNDEFINED_SYSFS_GPIO)
-		sprintf(_show_gpio, "%s %d", gpio->gpio_controller, gpio->gpio_line);
+		snprintf(_show_gpio, sizeof(_show_gpio), "%s %d",
+			 gpio->gpio_controller, gpio->gpio_line);
 	else
-		sprintf(_show_gpio, "%d", gpio->kernel_number);
+		snprintf(_show_gpio, sizeof(_show_gpio), "%d", gpio->kernel_number);
 
 	return _show_gpio;
 }
 
+/**
+ * set_label() - Build and cache the printable label of a GPIO
+ *
+ * @gpio:	The GPIO to build its label. Its internal data must be allocated.
+ *
+ * The label is '<controller> <line>' for GPIOs requested by controller and
+ * '<kernel_number>' for sysfs GPIOs. None of these fields change after the
+ * GPIO is requested.
+ */
+static void set_label(gpio_t *gpio)
+{
+	struct _gpio_t *_data = gpio->_data;
+
+	if (gpio->kernel_number == UNDEFINED_SYSFS_GPIO)
+		snprintf(_data->_label, sizeof(_data->_label), "%s %d",
+			 gpio->gpio_controller, gpio->gpio_line);
+	else
+		snprintf(_data->_label, sizeof(_data->_label), "%d",
+			 gpio->kernel_number);
+}
+
 /**
  * set_direction() - Set GPIO to input or output
  *
@@ -1115,7 +1118,7 @@ static int set_direction(libsoc_gpio_t *gpio, _gpio_dir_modes_t dir)
 	if (fd < 0)
 		return EXIT_FAILURE;
 
-	if (write(fd, gpio_dir_strings[dir], BUFF_SIZE) < 0) {
+	if (write(fd, gpio_dir_strings[dir], strlen(gpio_dir_strings[dir])) < 0) {
 		close(fd);
 		return EXIT_FAILURE;
 	}
@@ -1155,3 +1158,85 @@ static int check_mode(gpio_mode_t mode)
 		return EXIT_FAILURE;
 	}
 }
+
+/**
+ * set_mode() - Configure the mode of an already validated GPIO
+ *
+ * @gpio:	A valid requested GPIO.
+ * @mode:	A valid GPIO mode.
+ *
+ * Used by the request functions, which have already validated both the GPIO
+ * and the mode, and by 'ldx_gpio_set_mode()' after its own checks.
+ *
+ * Return: EXIT_SUCCESS on success, EXIT_FAILURE otherwise.
+ */
+static int set_mode(gpio_t *gpio, gpio_mode_t mode)
+{
+	int ret = EXIT_FAILURE;
+	struct _gpio_t *_data = NULL;
+
+	log_debug("%s: Setting mode for GPIO %s, mode: '%s' (%d)", __func__,
+		  show_gpio(gpio), gpio_mode_strings[mode], mode);
+
+	_data = gpio->_data;
+
+	if (gpio->kernel_number == UNDEFINED_SYSFS_GPIO) {
+		struct gpiod_line_request_config request_cfg = { 0 };
+		int default_val = gpiod_mode_cfg[mode].default_val;
+
+		request_cfg.consumer = show_gpio(gpio);
+		request_cfg.request_type = gpiod_mode_cfg[mode].request_type;
+
+		if (_data->_active_mode == GPIO_ACTIVE_LOW)
+			request_cfg.flags |= GPIOD_LINE_REQUEST_FLAG_ACTIVE_LOW;
+
+		if (gpiod_line_is_used(_data->_line)) {
+			/* Check if line was requested by us */
+			if (gpiod_line_is_requested(_data->_line)) {
+				log_debug("%s: GPIO %s was requested by us",
+					  __func__, show_gpio(gpio));
+
+				/* Release it so we can request it again */
+				gpiod_line_release(_data->_line);
+			} else {
+				log_error("%s: GPIO %s was in use by '%s'",
+					  __func__, show_gpio(gpio),
+					  gpiod_line_consumer(_data->_line));
+				return EXIT_FAILURE;
+			}
+		}
+
+		ret = gpiod_line_request(_data->_line, &request_cfg, default_val);
+		if (ret != EXIT_SUCCESS) {
+			log_error("%s: Unable to set GPIO %s to mode: '%s' (%d)",
+				  __func__, show_gpio(gpio), gpio_mode_strings[mode],
+				  mode);
+			return ret;
+		}
+	} else {
+		_gpio_dir_modes_t dir = sysfs_mode_cfg[mode].dir;
+		libsoc_gpio_edge_t edge = sysfs_mode_cfg[mode].edge;
+
+		ret = set_direction(_data->_internal_gpio, dir);
+		if (ret != EXIT_SUCCESS) {
+			log_error("%s: Unable to set GPIO %d direction to '%s' (%d)",
+				  __func__, gpio->kernel_number,
+				  gpio_dir_strings[dir], dir);
+			return ret;
+		}
+
+		if ((edge != EDGE_ERROR) && (edge != NONE)) {
+			ret = libsoc_gpio_set_edge(_data->_internal_gpio, edge);
+			if (ret != EXIT_SUCCESS) {
+				log_error("%s: Unable to set GPIO %d edge to '%s' (%d)",
+					  __func__, gpio->kernel_number,
+					  gpio_edge_strings[edge], edge);
+			}
+		}
+	}
+
+	if (ret == EXIT_SUCCESS)
+		_data->_mode = mode;
+
+	return ret;
+}
@@ -112,8 +112,7 @@ int ldx_i2c_list_available_buses(uint8_t **buses)
 		return -1;
 	}
 
-	for (i = 0; i < next; i++)
-		(*buses)[i] = _buses[i];
+	memcpy(*buses, _buses, next * sizeof(uint8_t));
 
 	return next;
 }
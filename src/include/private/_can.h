@@ -63,8 +63,6 @@ typedef struct can_err_cb {
  * @ifr:		Ifreq structure used by the socket layer.
  * @addr:		Sockaddr_can structure used by the socket layer.
  * @tx_skt:		Transmission socket.
- * @mtu:		Maximun transmit unit for the CAN interface.
- * @maxdlen:	Maximun length of the data to transmit.
  * @maxfd:		Maximun flexible data rate.
  * @can_fds:	CAN Flexible data rate.
  * @can_tout:	CAN timeval.
@@ -79,10 +77,8 @@ typedef struct {
 	struct ifreq		ifr;
 	struct sockaddr_can	addr;
 	int			tx_skt;
-	uint32_t		mtu;
-	uint32_t		maxdlen;
-
 	int			maxfd;
+
 	fd_set			can_fds;
 	struct timeval		can_tout;
 
@@ -66,6 +66,19 @@ int config_get_gpio_controller(const char * const alias, char * const controller
  */
 int config_get_gpio_line(const char * const alias);
 
+/**
+ * config_get_gpio_controller_line() - Find the GPIO controller and line of an
+ *				       alias
+ *
+ * @alias:	The GPIO alias.
+ * @controller: Array where the controller is stored on success.
+ *
+ * The configuration value is looked up and parsed only once for both fields.
+ *
+ * Return: The line, -1 on error.
+ */
+int config_get_gpio_controller_line(const char * const alias, char * const controller);
+
 /**
  * config_get_pwm_chip_number() - Find the chip PWM number of a given PWM alias
  *
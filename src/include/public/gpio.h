@@ -246,6 +246,28 @@ gpio_mode_t ldx_gpio_get_mode(gpio_t *gpio);
  */
 int ldx_gpio_set_value(gpio_t *gpio, gpio_value_t value);
 
+/**
+ * ldx_gpio_set_value_sequence() - Write a sequence of values to the given GPIO
+ *
+ * @gpio:	A requested GPIO to set its values.
+ * @values:	Array of GPIO values (gpio_value_t) to write in order:
+ *		GPIO_LOW or GPIO_HIGH.
+ * @count:	Number of values in the array.
+ * @delay_us:	Delay in microseconds between two consecutive writes, 0 for
+ *		no delay.
+ *
+ * This function is equivalent to calling 'ldx_gpio_set_value()' for each
+ * element of 'values', but the GPIO and all the values are validated only
+ * once, before the first write. It is intended for bit-banging or any other
+ * multi-write sequence on the same GPIO.
+ *
+ * The same mode restrictions as for 'ldx_gpio_set_value()' apply.
+ *
+ * Return: EXIT_SUCCESS on success, EXIT_FAILURE otherwise.
+ */
+int ldx_gpio_set_value_sequence(gpio_t *gpio, const gpio_value_t *values,
+				unsigned int count, unsigned int delay_us);
+
 /**
  * ldx_gpio_get_value() - Get the given GPIO value
  *
@@ -121,6 +121,7 @@ int ldx_cpu_enable_core(int core);
  * with 'ldx_cpu_free_available_freq()'.
  *
  * Return: An struct available_frequencies_t with the frequencies available.
+ *	   On error, 'data' is NULL and 'len' is 0.
  */
 available_frequencies_t ldx_cpu_get_available_freq();
 
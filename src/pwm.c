@@ -160,7 +160,7 @@ err_out:
 
 int ldx_pwm_get_number_of_channels_by_alias(char const * const pwm_alias)
 {
-	int chip = config_get_pwm_chip_number(pwm_alias);
+	int chip = ldx_pwm_get_chip(pwm_alias);
 
 	if (chip < 0)
 		return -1;
@@ -246,6 +246,9 @@ pwm_config_error_t ldx_pwm_set_freq(pwm_t *pwm, unsigned long freq_hz)
 {
 	unsigned int period;
 
+	if (check_valid_pwm(pwm) != EXIT_SUCCESS)
+		return PWM_CONFIG_ERROR_INVALID;
+
 	if (freq_hz == 0 || freq_hz > SECS_TO_NANOSECS)
 		return PWM_CONFIG_ERROR_INVALID;
 
@@ -262,9 +265,12 @@ long ldx_pwm_get_freq(pwm_t *pwm)
 {
 	int period;
 
+	if (check_valid_pwm(pwm) != EXIT_SUCCESS)
+		return -1;
+
 	log_debug("%s: Getting frequency of PWM %d:%d", __func__, pwm->chip, pwm->channel);
 
-	period = ldx_pwm_get_period(pwm);
+	period = libsoc_pwm_get_period(pwm->_data);
 
 	return (period > 0) ? (SECS_TO_NANOSECS / period) + 0.5 : -1;
 }
@@ -273,10 +279,13 @@ pwm_config_error_t ldx_pwm_set_duty_cycle(pwm_t *pwm, unsigned int duty_cycle)
 {
 	int current_period;
 
+	if (check_valid_pwm(pwm) != EXIT_SUCCESS)
+		return PWM_CONFIG_ERROR_INVALID;
+
 	log_debug("%s: Setting duty cycle of PWM %d:%d: %d ns", __func__,
 		  pwm->chip, pwm->channel, duty_cycle);
 
-	current_period = ldx_pwm_get_period(pwm);
+	current_period = libsoc_pwm_get_period(pwm->_data);
 	if (current_period > -1 && duty_cycle > (unsigned int)current_period) {
 		log_error("%s: Invalid duty cycle value, %d ns. Duty cycle must"
 			  " be less than the current period (%d ns)",
@@ -301,6 +310,10 @@ int ldx_pwm_get_duty_cycle(pwm_t *pwm)
 pwm_config_error_t ldx_pwm_set_duty_cycle_percentage(pwm_t *pwm, unsigned int percentage)
 {
 	int current_period;
+	unsigned int duty_cycle;
+
+	if (check_valid_pwm(pwm) != EXIT_SUCCESS)
+		return PWM_CONFIG_ERROR_INVALID;
 
 	if (percentage > 100) {
 		log_error("%s: Invalid duty cycle percentage %d%%. It must be between 0 and 100",
@@ -311,11 +324,18 @@ pwm_config_error_t ldx_pwm_set_duty_cycle_percentage(pwm_t *pwm, unsigned int pe
 	log_debug("%s: Setting duty cycle percentage of PWM %d:%d: %d%%",
 		  __func__, pwm->chip, pwm->channel, percentage);
 
-	current_period = ldx_pwm_get_period(pwm);
-	if (current_period == -1)
+	current_period = libsoc_pwm_get_period(pwm->_data);
+	if (current_period == -1) {
+		log_error("%s: Unable to get the PWM %d:%d period",
+			  __func__, pwm->chip, pwm->channel);
 		return PWM_CONFIG_ERROR;
+	}
+
+	/* A percentage of the current period never exceeds the period */
+	duty_cycle = (current_period / 100.0 * percentage) + 0.5;
 
-	return ldx_pwm_set_duty_cycle(pwm, (current_period / 100.0 * percentage) + 0.5);
+	return (libsoc_pwm_set_duty_cycle(pwm->_data, duty_cycle) == EXIT_SUCCESS) ?
+			PWM_CONFIG_ERROR_NONE : PWM_CONFIG_ERROR;
 }
 
 int ldx_pwm_get_duty_percentage(pwm_t *pwm)
@@ -323,11 +343,14 @@ int ldx_pwm_get_duty_percentage(pwm_t *pwm)
 	int duty_cycle;
 	int period;
 
+	if (check_valid_pwm(pwm) != EXIT_SUCCESS)
+		return -1;
+
 	log_debug("%s: Getting duty cycle percentage of PWM %d:%d", __func__,
 		  pwm->chip, pwm->channel);
 
-	duty_cycle = ldx_pwm_get_duty_cycle(pwm);
-	period = ldx_pwm_get_period(pwm);
+	duty_cycle = libsoc_pwm_get_duty_cycle(pwm->_data);
+	period = libsoc_pwm_get_period(pwm->_data);
 	if (duty_cycle > 0 && period > 0)
 		return (duty_cycle * 1.0 / period * 100) + 0.5;
 
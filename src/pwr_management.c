@@ -16,7 +16,10 @@
 
 #define _GNU_SOURCE
 
+#include <ctype.h>
+#include <dirent.h>
 #include <fcntl.h>
+#include <pthread.h>
 #include <stdlib.h>
 #include <string.h>
 #include <unistd.h>
@@ -59,8 +62,8 @@
 #define SCALING_FREQ_PATH			"scaling_setspeed"
 #define TEMPERATURE					"temp"
 
-// Commands
-#define COMMAND_GET_CORES 			"ls /sys/devices/system/cpu | awk '/cpu[0-9]/' | wc -l"
+#define CORE_ONLINE_PATH			CORES_PATH "/" CORES "%d/" ONLINE
+#define CORE_ONLINE_PATH_LEN		64
 
 // Governors Strings
 #define GOVERNOR_PERFORMANCE_STRING		"performance"
@@ -71,6 +74,19 @@
 #define GOVERNOR_INTERACTIVE_STRING		"interactive"
 #define	GOVERNOR_SCHEDUTIL_STRING		"schedutil"
 
+static int number_of_cores = -1;
+static pthread_once_t number_of_cores_once = PTHREAD_ONCE_INIT;
+
+static const char * const governor_strings[MAX_GOVERNORS] = {
+	[GOVERNOR_PERFORMANCE] = GOVERNOR_PERFORMANCE_STRING,
+	[GOVERNOR_POWERSAVE] = GOVERNOR_POWERSAVE_STRING,
+	[GOVERNOR_USERSPACE] = GOVERNOR_USERSPACE_STRING,
+	[GOVERNOR_ONDEMAND] = GOVERNOR_ONDEMAND_STRING,
+	[GOVERNOR_CONSERVATIVE] = GOVERNOR_CONSERVATIVE_STRING,
+	[GOVERNOR_INTERACTIVE] = GOVERNOR_INTERACTIVE_STRING,
+	[GOVERNOR_SCHEDUTIL] = GOVERNOR_SCHEDUTIL_STRING,
+};
+
 /**
  * check_frequency() - Verify that the frequency is valid
  *
@@ -83,11 +99,10 @@ static int check_frequency(int freq)
 	available_frequencies_t frequencies;
 	int i;
 
-	if (freq < ldx_cpu_get_min_freq() || freq > ldx_cpu_get_max_freq()) {
-		log_debug("%s: %d is not a valid frequency", __func__, freq);
-		return EXIT_FAILURE;
-	}
-
+	/*
+	 * The available frequencies are already bounded by cpuinfo_min_freq
+	 * and cpuinfo_max_freq, so a single lookup in that list is enough.
+	 */
 	frequencies = ldx_cpu_get_available_freq();
 
 	for (i = 0; i < frequencies.len; i++) {
@@ -112,54 +127,25 @@ static int check_frequency(int freq)
  */
 static int get_int_from_path(const char* path)
 {
-	char *data = NULL;
-	char *cmd;
+	FILE *fp;
 	int number;
 
-	asprintf(&cmd, READ_PATH, path);
-	if (!cmd) {
-		log_error("%s: Unable to allocate memory for the command", __func__);
+	fp = fopen(path, "r");
+	if (fp == NULL) {
+		log_error("%s: Unable to open %s", __func__, path);
 		return -1;
 	}
 
-	data = get_cmd_output(cmd);
-
-	if (data == NULL) {
+	if (fscanf(fp, "%d", &number) != 1) {
 		log_error("%s: Unable to get the data from path", __func__);
-		free(cmd);
-		return -1;
+		number = -1;
 	}
 
-	number = atoi(data);
-
-	free(data);
-	free(cmd);
+	fclose(fp);
 
 	return number;
 }
 
-/**
- * get_frequency_from_path() - Get the value of a selected frequency path
- *
- * @path:	The path to get the frequency value.
- *
- * Return: The frequency value read from the path, -1 on failure.
- */
-static int get_frequency_from_path(const char* path)
-{
-	char *dir_path = NULL;
-	int frequency;
-
-	dir_path = concat_path(FREQ_PATH, path);
-	if (dir_path == NULL)
-		return -1;
-
-	frequency = get_int_from_path(dir_path);
-	free(dir_path);
-
-	return frequency;
-}
-
 /**
  * check_number_of_cores() - Check if a core index is valid or not
  *
@@ -169,7 +155,7 @@ static int get_frequency_from_path(const char* path)
  */
 static int check_core_index(int core)
 {
-	if ((core > ldx_cpu_get_number_of_cores()) || (core < 0))
+	if ((core >= ldx_cpu_get_number_of_cores()) || (core < 0))
 		return EXIT_FAILURE;
 
 	return EXIT_SUCCESS;
@@ -184,98 +170,113 @@ static int check_core_index(int core)
  */
 static int ldx_cpu_set_status_core(int core, int status)
 {
-	char *cmd;
+	char path[CORE_ONLINE_PATH_LEN];
 
 	if (check_core_index(core)) {
 		log_error("%s: Unable to set the core %d", __func__, core);
 		return EXIT_FAILURE;
 	}
 
-	asprintf(&cmd, "%s/%s%d/%s", CORES_PATH, CORES, core, ONLINE);
-	if (!cmd) {
-		log_error("%s: Unable to allocate memory for the command", __func__);
-		return -1;
-	}
+	snprintf(path, sizeof(path), CORE_ONLINE_PATH, core);
 
-	if (write_file(cmd, "%d", status) != 0) {
+	if (write_file(path, "%d", status) != 0) {
 		log_error("%s: Unable to set the core status", __func__);
-		free(cmd);
 		return EXIT_FAILURE;
 	}
 
-	free(cmd);
-
 	return EXIT_SUCCESS;
 }
 
+/**
+ * get_gpu_mult_path() - Get the GPU multiplier file of the current platform
+ *
+ * Return: The GPU multiplier path, NULL if the platform has no GPU support.
+ */
+static const char *get_gpu_mult_path(void)
+{
+	static const char * const gpu_paths[] = {
+		[CC8X_PLATFORM] = CC8X_GPU_PATH GPU_MULT,
+		[CC6_PLATFORM] = CC6_GPU_PATH GPU_MULT,
+		[CC6UL_PLATFORM] = NULL,
+		[CC8MN_PLATFORM] = CC8MN_GPU_PATH GPU_MULT,
+	};
+	digi_platform_t platform = get_digi_platform();
+
+	if (platform < 0 || platform >= (int)ARRAY_SIZE(gpu_paths)) {
+		log_error("%s: Unsupported platform", __func__);
+		return NULL;
+	}
+
+	if (gpu_paths[platform] == NULL)
+		log_error("%s: This platform doesn't support GPU management", __func__);
+
+	return gpu_paths[platform];
+}
+
 const char* ldx_cpu_get_governor_string_from_type(governor_mode_t governor)
 {
-	switch (governor) {
-	case GOVERNOR_PERFORMANCE:
-		return GOVERNOR_PERFORMANCE_STRING;
-	case GOVERNOR_POWERSAVE:
-		return GOVERNOR_POWERSAVE_STRING;
-	case GOVERNOR_USERSPACE:
-		return GOVERNOR_USERSPACE_STRING;
-	case GOVERNOR_ONDEMAND:
-		return GOVERNOR_ONDEMAND_STRING;
-	case GOVERNOR_CONSERVATIVE:
-		return GOVERNOR_CONSERVATIVE_STRING;
-	case GOVERNOR_INTERACTIVE:
-		return GOVERNOR_INTERACTIVE_STRING;
-	case GOVERNOR_SCHEDUTIL:
-		return GOVERNOR_SCHEDUTIL_STRING;
-	default:
+	if (governor <= GOVERNOR_INVALID || governor >= MAX_GOVERNORS) {
 		log_error("%s: Unrecognized governor %d", __func__, governor);
+		return NULL;
 	}
 
-	return NULL;
+	return governor_strings[governor];
 }
 
 governor_mode_t ldx_cpu_get_governor_type_from_string(const char *governor_string){
-	if (strcmp(governor_string, GOVERNOR_PERFORMANCE_STRING) == 0) {
-		return GOVERNOR_PERFORMANCE;
-	} else if (strcmp(governor_string, GOVERNOR_POWERSAVE_STRING) == 0) {
-		return GOVERNOR_POWERSAVE;
-	} else if (strcmp(governor_string, GOVERNOR_USERSPACE_STRING) == 0) {
-		return GOVERNOR_USERSPACE;
-	} else if (strcmp(governor_string, GOVERNOR_ONDEMAND_STRING) == 0) {
-		return GOVERNOR_ONDEMAND;
-	} else if (strcmp(governor_string, GOVERNOR_CONSERVATIVE_STRING) == 0) {
-		return GOVERNOR_CONSERVATIVE;
-	} else if (strcmp(governor_string, GOVERNOR_INTERACTIVE_STRING) == 0) {
-		return GOVERNOR_INTERACTIVE;
-	} else if (strcmp(governor_string, GOVERNOR_SCHEDUTIL_STRING) == 0) {
-		return GOVERNOR_SCHEDUTIL;
+	governor_mode_t governor;
+
+	for (governor = 0; governor < MAX_GOVERNORS; governor++) {
+		if (strcmp(governor_string, governor_strings[governor]) == 0)
+			return governor;
 	}
 
 	return GOVERNOR_INVALID;
 }
 
-int ldx_cpu_get_number_of_cores()
+/**
+ * count_cores() - Count the CPU cores
+ *
+ * Called through 'pthread_once()' by 'ldx_cpu_get_number_of_cores()'. The
+ * set of possible CPUs is fixed at boot, so it is only read once.
+ */
+static void count_cores(void)
 {
-	char *cores = NULL;
+	DIR *dir;
+	struct dirent *entry;
 	int num_cores = 0;
+	size_t prefix_len = strlen(CORES);
 
 	log_debug("%s: Getting number of cores from the CPU", __func__);
 
-	cores = get_cmd_output(COMMAND_GET_CORES);
-
-	if (cores == NULL) {
+	dir = opendir(CORES_PATH);
+	if (dir == NULL) {
 		log_error("%s: Unable to get the number of CPU cores", __func__);
-		return -1;
+		return;
 	}
 
-	num_cores = atoi(cores);
-	free(cores);
+	/* Count the 'cpuN' entries */
+	while ((entry = readdir(dir)) != NULL) {
+		if (strncmp(entry->d_name, CORES, prefix_len) == 0 &&
+		    isdigit((unsigned char)entry->d_name[prefix_len]))
+			num_cores++;
+	}
+
+	closedir(dir);
 
-	return num_cores;
+	number_of_cores = num_cores;
+}
+
+int ldx_cpu_get_number_of_cores()
+{
+	pthread_once(&number_of_cores_once, count_cores);
+
+	return number_of_cores;
 }
 
 int ldx_cpu_get_status_core(int core)
 {
-	char *cmd;
-	int status;
+	char path[CORE_ONLINE_PATH_LEN];
 
 	if (check_core_index(core)) {
 		log_error("%s: Unable to get the status of the core %d",
@@ -283,16 +284,9 @@ int ldx_cpu_get_status_core(int core)
 		return -1;
 	}
 
-	asprintf(&cmd, "%s/%s%d/%s", CORES_PATH, CORES, core, ONLINE);
-	if (!cmd) {
-		log_error("%s: Unable to allocate memory for the command", __func__);
-		return -1;
-	}
-
-	status = get_int_from_path(cmd);
-	free(cmd);
+	snprintf(path, sizeof(path), CORE_ONLINE_PATH, core);
 
-	return status;
+	return get_int_from_path(path);
 }
 
 int ldx_cpu_enable_core(int core)
@@ -310,8 +304,8 @@ available_frequencies_t ldx_cpu_get_available_freq()
 	char *available_frequencies = NULL;
 	char *cmd;
 	char *ptr;
-	available_frequencies_t freq;
-	int i = 0;
+	available_frequencies_t freq = { NULL, 0 };
+	size_t i = 0;
 
 	asprintf(&cmd, READ_PATH, FREQ_PATH AVALAIBLE_SCALING_FREQ);
 	if (!cmd) {
@@ -326,29 +320,36 @@ available_frequencies_t ldx_cpu_get_available_freq()
 		return freq;
 	}
 
-	ptr = available_frequencies;
-
-	/* Count the spaces inside the returned string*/
-	while (*ptr) {
-		if (*ptr == ' ') {
+	/*
+	 * Count the words inside the returned string. The list may or may not
+	 * end with a space ("900000 1200000 "), so count the start of each
+	 * word instead of the separators.
+	 */
+	for (ptr = available_frequencies; *ptr; ptr++) {
+		if (*ptr != ' ' && (ptr == available_frequencies || *(ptr - 1) == ' '))
 			i++;
-		}
-		ptr++;
 	}
 
-	/*There is an extra space at the end of the list "900000 1200000 "
-	 * So, the list of frequencies is equal to the number of ' '*/
-	freq.data = malloc((i) * sizeof(*freq.data));
-	freq.len = i;
-	i = 0;
+	if (i == 0) {
+		free(available_frequencies);
+		free(cmd);
+		return freq;
+	}
+
+	freq.data = malloc(i * sizeof(*freq.data));
+	if (freq.data == NULL) {
+		log_error("%s: Unable to allocate memory for the frequencies", __func__);
+		free(available_frequencies);
+		free(cmd);
+		return freq;
+	}
 
 	ptr = strtok(available_frequencies, " ");
 
-	while (ptr != NULL) {
+	while (ptr != NULL && freq.len < i) {
 		log_debug("%s: Frequency available %s", __func__, ptr);
-		freq.data[i] = atoi(ptr);
+		freq.data[freq.len++] = atoi(ptr);
 		ptr = strtok(NULL, " ");
-		i++;
 	}
 
 	free(available_frequencies);
@@ -365,10 +366,15 @@ void ldx_cpu_free_available_freq(available_frequencies_t freq)
 
 int ldx_cpu_is_governor_available(governor_mode_t governor)
 {
+	const char *governor_string = NULL;
 	char *cmd_output = NULL;
 	char *cmd;
 	char *ptr;
 
+	governor_string = ldx_cpu_get_governor_string_from_type(governor);
+	if (governor_string == NULL)
+		return EXIT_FAILURE;
+
 	asprintf(&cmd, READ_PATH, FREQ_PATH AVALAIBLE_SCALING_GOVERNORS);
 	if (!cmd) {
 		log_error("%s: Unable to allocate memory for the command", __func__);
@@ -385,7 +391,7 @@ int ldx_cpu_is_governor_available(governor_mode_t governor)
 	ptr = strtok(cmd_output, " ");
 
 	while (ptr != NULL) {
-		if (ldx_cpu_get_governor_type_from_string(ptr) == governor) {
+		if (strcmp(ptr, governor_string) == 0) {
 			free(cmd_output);
 			free(cmd);
 			return EXIT_SUCCESS;
@@ -402,7 +408,6 @@ int ldx_cpu_is_governor_available(governor_mode_t governor)
 int ldx_cpu_set_governor (governor_mode_t governor)
 {
 	const char *governor_string = NULL;
-	char *cmd;
 
 	governor_string = ldx_cpu_get_governor_string_from_type(governor);
 
@@ -410,20 +415,11 @@ int ldx_cpu_set_governor (governor_mode_t governor)
 		return EXIT_FAILURE;
 	}
 
-	asprintf(&cmd, "%s/%s", FREQ_PATH, SCALING_GOVERNOR);
-	if (!cmd) {
-		log_error("%s: Unable to allocate memory for the command", __func__);
-		return EXIT_FAILURE;
-	}
-
-	if (write_file(cmd, "%s", governor_string) != 0) {
+	if (write_file(FREQ_PATH SCALING_GOVERNOR, "%s", governor_string) != 0) {
 		log_error("%s: Unable to set the governor status", __func__);
-		free(cmd);
 		return EXIT_FAILURE;
 	}
 
-	free(cmd);
-
 	return EXIT_SUCCESS;
 }
 
@@ -464,27 +460,27 @@ governor_mode_t ldx_cpu_get_governor()
 
 int ldx_cpu_get_max_freq()
 {
-	return get_frequency_from_path(MAX_FREQ_PATH);
+	return get_int_from_path(FREQ_PATH MAX_FREQ_PATH);
 }
 
 int ldx_cpu_get_min_freq()
 {
-	return get_frequency_from_path(MIN_FREQ_PATH);
+	return get_int_from_path(FREQ_PATH MIN_FREQ_PATH);
 }
 
 int ldx_cpu_get_max_scaling_freq()
 {
-	return get_frequency_from_path(MAX_SCALING_FREQ_PATH);
+	return get_int_from_path(FREQ_PATH MAX_SCALING_FREQ_PATH);
 }
 
 int ldx_cpu_get_min_scaling_freq()
 {
-	return get_frequency_from_path(MIN_SCALING_FREQ_PATH);
+	return get_int_from_path(FREQ_PATH MIN_SCALING_FREQ_PATH);
 }
 
 int ldx_cpu_get_scaling_freq()
 {
-	return get_frequency_from_path(SCALING_FREQ_PATH);
+	return get_int_from_path(FREQ_PATH SCALING_FREQ_PATH);
 }
 
 int ldx_cpu_set_min_scaling_freq(int freq)
@@ -662,97 +658,30 @@ int ldx_cpu_get_usage()
 
 int ldx_gpu_set_multiplier(int multiplier) {
 
-	digi_platform_t platform = get_digi_platform();
-	char *path;
-	char *dir_path = NULL;
-
-	switch (platform) {
-	case CC8X_PLATFORM:
-		asprintf(&path, "%s", CC8X_GPU_PATH);
-		break;
-	case CC8MN_PLATFORM:
-		asprintf(&path, "%s", CC8MN_GPU_PATH);
-		break;
-	case CC6_PLATFORM:
-		asprintf(&path, "%s", CC6_GPU_PATH);
-		break;
-	case CC6UL_PLATFORM:
-		log_error("%s: This platform doesn't support GPU management", __func__);
-		return -1;
-	default:
-		log_error("%s: Unsupported platform", __func__);
-		return -1;
-	}
+	const char *path;
 
-	if (!path) {
-		log_error("%s: Unable to allocate memory for the command", __func__);
+	path = get_gpu_mult_path();
+	if (path == NULL)
 		return -1;
-	}
-
-	dir_path = concat_path(path, GPU_MULT);
 
-	if (dir_path == NULL) {
-		free(path);
-		return EXIT_FAILURE;
-	}
-
-	if (write_file(dir_path, "%d", multiplier) != 0) {
+	if (write_file(path, "%d", multiplier) != 0) {
 		log_error("%s: Unable to set the selected multiplier %d",
 				  __func__, multiplier);
-		free(dir_path);
-		free(path);
 		return EXIT_FAILURE;
 	}
 
-	free(dir_path);
-	free(path);
-
 	return EXIT_SUCCESS;
 }
 
 int ldx_gpu_get_multiplier()
 {
-	char *dir_path = NULL;
-	char *path;
-	digi_platform_t platform;
-	int multiplier;
-
-	platform = get_digi_platform();
-
-	switch (platform) {
-	case CC8X_PLATFORM:
-		asprintf(&path, "%s", CC8X_GPU_PATH);
-		break;
-	case CC8MN_PLATFORM:
-		asprintf(&path, "%s", CC8MN_GPU_PATH);
-		break;
-	case CC6_PLATFORM:
-		asprintf(&path, "%s", CC6_GPU_PATH);
-		break;
-	case CC6UL_PLATFORM:
-		log_error("%s: This platform doesn't support GPU management", __func__);
-		return -1;
-	default:
-		log_error("%s: Unsupported platform", __func__);
-		return -1;
-	}
+	const char *path;
 
-	if (!path) {
-		log_error("%s: Unable to allocate memory for the path", __func__);
+	path = get_gpu_mult_path();
+	if (path == NULL)
 		return -1;
-	}
-
-	dir_path = concat_path(path, GPU_MULT);
-	if (dir_path == NULL) {
-		free(path);
-		return -1;
-	}
-
-	multiplier = get_int_from_path(dir_path);
-	free(dir_path);
-	free(path);
 
-	return multiplier;
+	return get_int_from_path(path);
 }
 
 int ldx_gpu_set_min_multiplier(int multiplier)
@@ -47,8 +47,8 @@ static const char * const spi_cs_strings[] = {
 };
 
 static const char * const spi_bo_strings[] = {
-	M(SPI_BO_LSB_FIRST)
 	M(SPI_BO_MSB_FIRST)
+	M(SPI_BO_LSB_FIRST)
 };
 
 static const char * const spi_bpw_strings[] = {
@@ -57,6 +57,13 @@ static const char * const spi_bpw_strings[] = {
 };
 #undef M
 
+static const spi_clk_mode_t spi_clk_modes[] = {
+	[SPI_MODE_0] = SPI_CLK_MODE_0,
+	[SPI_MODE_1] = SPI_CLK_MODE_1,
+	[SPI_MODE_2] = SPI_CLK_MODE_2,
+	[SPI_MODE_3] = SPI_CLK_MODE_3,
+};
+
 static int check_spi(spi_t *spi);
 static int check_transfer_mode(spi_transfer_cfg_t *transfer_mode);
 static int check_clock_mode(spi_clk_mode_t clock_mode);
@@ -142,20 +149,42 @@ int ldx_spi_list_available_devices(uint8_t **devices)
 	uint8_t i, count = 0;
 	uint16_t _devices[MAX_SPI_DEVICES] = {0};
 	glob_t globresults;
-	char path[20];
+	size_t n;
+	int ret;
 
-	for (i = 0; i < MAX_SPI_DEVICES / 2; i++) {
-		sprintf(path, "/dev/spidev%d.*", i);
-		if (glob(path, 0, NULL, &globresults) == 0) {
-			_devices[count] = i;
-			count++;
-		}
+	/* Scan '/dev' once and pick the device numbers from the node names */
+	ret = glob("/dev/spidev*.*", 0, NULL, &globresults);
+	if (ret == GLOB_NOMATCH)
+		return 0;
+	if (ret) {
+		log_error("%s: Unable to scan for SPI devices", __func__);
+		globfree(&globresults);
+		return -1;
+	}
 
-		sprintf(path, "/dev/spidev%d.*", HIGH_SPI_BASE - i);
-		if (glob(path, 0, NULL, &globresults) == 0) {
-			_devices[count] = HIGH_SPI_BASE - i;
-			count++;
-		}
+	for (n = 0; n < globresults.gl_pathc && count < MAX_SPI_DEVICES; n++) {
+		unsigned int device, slave;
+
+		if (sscanf(globresults.gl_pathv[n], "/dev/spidev%u.%u",
+			   &device, &slave) != 2)
+			continue;
+
+		if (device >= MAX_SPI_DEVICES / 2 &&
+		    (device > HIGH_SPI_BASE ||
+		     device <= HIGH_SPI_BASE - MAX_SPI_DEVICES / 2))
+			continue;
+
+		/* Keep the list sorted, glob() returns the nodes in name order */
+		for (i = 0; i < count && _devices[i] < device; i++)
+			;
+
+		if (i < count && _devices[i] == device)
+			continue;
+
+		memmove(&_devices[i + 1], &_devices[i],
+			(count - i) * sizeof(_devices[0]));
+		_devices[i] = device;
+		count++;
 	}
 
 	globfree(&globresults);
@@ -198,8 +227,7 @@ int ldx_spi_list_available_slaves(uint8_t spi_device, uint8_t **slaves)
 		return -1;
 	}
 
-	for (i = 0; i < count; i++)
-		(*slaves)[i] = _slaves[i];
+	memcpy(*slaves, _slaves, count * sizeof(uint8_t));
 
 	return count;
 }
@@ -309,25 +337,8 @@ int ldx_spi_get_transfer_mode(spi_t *spi, spi_transfer_cfg_t *transfer_mode)
 		return EXIT_FAILURE;
 	}
 
-	/* Determine the clock mode */
-	switch (read_value) {
-	case SPI_MODE_0:
-		transfer_mode->clk_mode = SPI_CLK_MODE_0;
-		break;
-	case SPI_MODE_1:
-		transfer_mode->clk_mode = SPI_CLK_MODE_1;
-		break;
-	case SPI_MODE_2:
-		transfer_mode->clk_mode = SPI_CLK_MODE_2;
-		break;
-	case SPI_MODE_3:
-		transfer_mode->clk_mode = SPI_CLK_MODE_3;
-		break;
-	default:
-		log_error("%s: Invalid SPI mode: %d", __func__, read_value);
-		transfer_mode->clk_mode = SPI_CLK_MODE_ERROR;
-		break;
-	}
+	/* Determine the clock mode, CPOL and CPHA are the two lowest bits */
+	transfer_mode->clk_mode = spi_clk_modes[read_value & SPI_MODE_3];
 
 	/* Determine the chip select */
 	switch (read_value & (SPI_CS_HIGH | SPI_NO_CS)) {
@@ -346,17 +357,8 @@ int ldx_spi_get_transfer_mode(spi_t *spi, spi_transfer_cfg_t *transfer_mode)
 	}
 
 	/* Determine the bit order */
-	switch (read_value & SPI_LSB_FIRST) {
-	case SPI_LSB_FIRST:
-		transfer_mode->bit_order = SPI_BO_LSB_FIRST;
-		break;
-	case SPI_BO_MSB_FIRST:
-		transfer_mode->bit_order = SPI_BO_MSB_FIRST;
-		break;
-	default:
-		transfer_mode->chip_select = SPI_BO_ERROR;
-		break;
-	}
+	transfer_mode->bit_order = (read_value & SPI_LSB_FIRST) ?
+				   SPI_BO_LSB_FIRST : SPI_BO_MSB_FIRST;
 
 	return EXIT_SUCCESS;
 }
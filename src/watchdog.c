@@ -32,7 +32,7 @@ wd_t *ldx_watchdog_request(char const * const wd_device_file)
 	wd_t init_wd = {wd_device_file, 0};
 	wd_internal_t *internal_data = NULL;
 
-	if (wd_device_file == NULL || strlen(wd_device_file) <= 0) {
+	if (wd_device_file == NULL || wd_device_file[0] == '\0') {
 		log_error("%s: Invalid watchdog device node", __func__);
 		return NULL;
 	}
@@ -201,7 +201,7 @@ int ldx_watchdog_get_timeleft(wd_t *wd)
 wd_info_t *ldx_watchdog_get_support(wd_t *wd)
 {
 	wd_internal_t *_wd = NULL;
-	struct watchdog_info *ident;
+	struct watchdog_info ident;
 	wd_info_t *wd_info = NULL;
 
 	if (wd == NULL) {
@@ -211,20 +211,14 @@ wd_info_t *ldx_watchdog_get_support(wd_t *wd)
 
 	_wd = (wd_internal_t *) wd->_data;
 
-	ident = calloc(1, sizeof(struct watchdog_info));
-	if (ident == NULL) {
-		log_error("%s: Unable to request internal watchdog info: %s, cannot allocate memory",
-				__func__, wd->node);
-		return NULL;
-	}
+	memset(&ident, 0, sizeof(ident));
 
-	if (!ioctl(_wd->fd, WDIOC_GETSUPPORT, ident)) {
+	if (!ioctl(_wd->fd, WDIOC_GETSUPPORT, &ident)) {
 		log_debug("%s: watchdog support was obtained\n",
 				__func__);
 	} else {
 		log_error("%s: Failed to get watchdog support\n",
 				__func__);
-		free(ident);
 		return NULL;
 	}
 
@@ -232,14 +226,12 @@ wd_info_t *ldx_watchdog_get_support(wd_t *wd)
 	if (wd_info == NULL) {
 		log_error("%s: Unable to request watchdog info: %s, cannot allocate memory",
 				__func__, wd->node);
-		free(ident);
 		return NULL;
 	}
-	memcpy(wd_info->identity, ident->identity, sizeof(ident->identity));
-	wd_info->options = ident->options;
-	wd_info->firmware_version = ident->firmware_version;
+	memcpy(wd_info->identity, ident.identity, sizeof(ident.identity));
+	wd_info->options = ident.options;
+	wd_info->firmware_version = ident.firmware_version;
 
-	free(ident);
 	return wd_info;
 }
 